@@ -1,5 +1,10 @@
 import json
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
 """
 Script to extract valid samples from a structured API parameter validation schema.
 
@@ -34,32 +39,37 @@ Output JSON format:
 """
 
 def extract_valid_samples(input_file: str, output_file: str):
-    with open(input_file, 'r') as f:
-        data = json.load(f)
+    with open(input_file, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
-    output = []
+    # First sample of each (param_name, category), deduplicated across all entries
+    seen = {}
 
     for entry in data:
         param_name = entry.get('param_name')
-        valid_entries = entry.get('valid', [])
-        seen_categories = set()
-
-        for valid in valid_entries:
-            category = valid.get('category')
-            samples = valid.get('samples', [])
 
-            if category not in seen_categories and samples:
-                seen_categories.add(category)
-                output.append({
-                    "name": param_name,
-                    "value": samples[0]
-                })
+        for valid in entry.get('valid', ()):
+            key = (param_name, valid.get('category'))
+            # Only the first sample of a category is kept, skip the rest early
+            if key in seen:
+                continue
+            samples = valid.get('samples')
+            if samples:
+                seen[key] = samples[0]
 
-    # Sort output by 'name'
-    output_sorted = sorted(output, key=lambda x: x['name'])
+    # Sort output by 'name', the sort is stable so categories keep their input order
+    output_sorted = [
+        {"name": param_name, "value": value}
+        for (param_name, _), value in sorted(seen.items(), key=lambda item: item[0][0])
+    ]
 
-    with open(output_file, 'w') as f:
-        json.dump(output_sorted, f, indent=2)
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(output_sorted, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(output_sorted, f, indent=2, ensure_ascii=False)
 
 
 if __name__ == '__main__':
@@ -6,92 +6,255 @@ The script outputs a JSON file listing:
     - Edges covered in file2 but not in file1
 
 Usage:
-    python compare_edges.py <file1.json> <file2.json> [output.json]
+    python compare_edges.py <file1.json> <file2.json> [output.json] [--cache {file1,file2,both}]
 
 Arguments:
     file1.json      Path to the first JSON report file
     file2.json      Path to the second JSON report file
     output.json     (Optional) Path to the output JSON file (default: edge_diff.json)
+    --cache         (Optional) Cache the parsed covered edges of file1, file2 or both under
+                    $XDG_CACHE_HOME/rest_trace_fuzzer (default ~/.cache), keyed by path, mtime and size.
+                    Useful for a baseline report compared on every CI run. Off by default.
 
 Output:
     A JSON file with two lists: "only_in_file1" and "only_in_file2", each containing edge details.
 """
 
+import glob
+import hashlib
 import json
-import sys
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 
-def load_edges(filename):
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # pysimdjson is optional, fall back to a full parse
+    simdjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional, only used when orjson is missing
+    ijson = None
+
+# Parsed covered edges are cached here, keyed by report path, mtime and size
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "rest_trace_fuzzer")
+# Bump when the layout of the cached covered edges changes
+EDGE_CACHE_VERSION = 1
+
+def iter_edges(filename):
+    """
+    Iterate over the edges of the final call info graph in a JSON report file.
+
+    The backend is picked from what is installed: pysimdjson (lazy proxies over
+    one parsed buffer), then orjson (full parse). Without either, ijson streams
+    the edges one at a time, which keeps memory low but parses slower than
+    orjson. The standard json module is the last resort.
+
+    Args:
+        filename (str): Path to the JSON report file.
+
+    Yields:
+        Each edge, either as a dict or as a lazy simdjson proxy.
+    """
+    if simdjson is not None:
+        with open(filename, 'rb') as f:
+            raw = f.read()
+        # Keep the document as lazy proxies, so that only the fields we read
+        # and the covered edges we keep are turned into Python objects.
+        parser = simdjson.Parser()
+        yield from parser.parse(raw)['finalCallInfoGraph']['edges']
+    elif orjson is None and ijson is not None:
+        # Only the 'edges' subtree is built, one edge at a time
+        with open(filename, 'rb') as f:
+            yield from ijson.items(f, 'finalCallInfoGraph.edges.item', use_float=True)
+    else:
+        with open(filename, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        yield from data['finalCallInfoGraph']['edges']
+
+def materialize(value):
+    """
+    Convert a lazy simdjson proxy into a plain Python object.
+
+    Args:
+        value: A simdjson Object/Array proxy, or an already decoded value.
+
+    Returns:
+        The value as plain Python dicts and lists.
+    """
+    if hasattr(value, 'as_dict'):
+        return value.as_dict()
+    return value
+
+def load_edges(filename, use_cache=False):
     """
     Load covered edges from a JSON report file.
 
+    Args:
+        filename (str): Path to the JSON report file.
+        use_cache (bool): Reuse covered edges pickled to CACHE_DIR by an earlier run if the
+            file is unchanged, and store them there otherwise. Only worth it for files that
+            are compared repeatedly, such as a baseline report.
+
+    Returns:
+        dict: Covered edges, see parse_edges.
+    """
+    if not use_cache:
+        return parse_edges(filename)
+
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    # One cache entry per report path; the state key changes with the file content
+    path_key = hashlib.blake2b(f"{EDGE_CACHE_VERSION}\0{path}".encode(), digest_size=8).hexdigest()
+    state_key = hashlib.blake2b(f"{stat.st_mtime_ns}\0{stat.st_size}".encode(), digest_size=8).hexdigest()
+    cache_file = os.path.join(CACHE_DIR, f"edges_{path_key}_{state_key}.pkl")
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        pass  # missing or unreadable cache, caching is best effort
+
+    covered_edges = parse_edges(path)
+    # Write to a temporary file first, so that concurrent runs never read a partial cache
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(covered_edges, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+        # Entries for older versions of the same report can never be hit again
+        for stale_file in glob.glob(os.path.join(CACHE_DIR, f"edges_{path_key}_*.pkl")):
+            if stale_file != cache_file:
+                os.remove(stale_file)
+    except Exception:
+        pass  # caching is best effort
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    return covered_edges
+
+def parse_edges(filename):
+    """
+    Parse covered edges from a JSON report file.
+
     Args:
         filename (str): Path to the JSON report file.
 
     Returns:
         dict: A dictionary mapping edge keys to edge details (source and target).
-              The edge key is a tuple:
-              (source_service, source_endpoint, source_method, target_service, target_endpoint, target_method)
+              The edge key is a bytes object joining, with NUL separators:
+              source_service, source_endpoint, source_method, target_service, target_endpoint, target_method
               Only edges with hitCount > 0 are included.
     """
-    with open(filename, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    edges = data['finalCallInfoGraph']['edges']
     covered_edges = {}
-    for edge in edges:
-        if edge.get('hitCount', 0) > 0:
-            edge_key = (
-                edge['source']['serviceName'],
-                edge['source']['simpleAPIMethod']['endpoint'],
-                edge['source']['simpleAPIMethod']['method'],
-                edge['target']['serviceName'],
-                edge['target']['simpleAPIMethod']['endpoint'],
-                edge['target']['simpleAPIMethod']['method'],
-            )
-            covered_edges[edge_key] = {
-                "source": edge['source'],
-                "target": edge['target']
-            }
+    for edge in iter_edges(filename):
+        if edge.get('hitCount', 0) <= 0:
+            continue
+        # Look up each nested object once, this loop runs once per edge
+        source = edge['source']
+        target = edge['target']
+        source_api = source['simpleAPIMethod']
+        target_api = target['simpleAPIMethod']
+        # Pack the six identifying fields into one bytes object, so that
+        # hashing and comparing a key touches a single buffer. Join first and
+        # encode once, per-field encoding costs more than the diff saves.
+        edge_key = '\0'.join((
+            source['serviceName'],
+            source_api['endpoint'],
+            source_api['method'],
+            target['serviceName'],
+            target_api['endpoint'],
+            target_api['method'],
+        )).encode('utf-8')
+        covered_edges[edge_key] = {
+            "source": materialize(source),
+            "target": materialize(target)
+        }
     return covered_edges
 
-def compare_coverage(file1, file2):
+def count_shared_edges(covered1, covered2):
+    """
+    Count the edges covered in both reports.
+
+    Args:
+        covered1 (dict): Covered edges of the first report, as returned by load_edges.
+        covered2 (dict): Covered edges of the second report, as returned by load_edges.
+
+    Returns:
+        int: Number of edge keys present in both dictionaries.
+    """
+    # Iterate the smaller side and probe the larger one, so that the cost is
+    # bounded by the shorter report (e.g. a short fuzz run against a baseline).
+    small, large = (covered1, covered2) if len(covered1) < len(covered2) else (covered2, covered1)
+    return sum(1 for k in small if k in large)
+
+def compare_coverage(file1, file2, cache1=False, cache2=False):
     """
     Compare covered edges between two JSON report files.
 
     Args:
         file1 (str): Path to the first JSON report file.
         file2 (str): Path to the second JSON report file.
+        cache1 (bool): Cache the covered edges of file1 across runs, see load_edges.
+        cache2 (bool): Cache the covered edges of file2 across runs, see load_edges.
 
     Returns:
-        tuple: Two lists:
+        tuple: Two lists and a count:
             - only_in_1: Edges covered in file1 but not in file2.
             - only_in_2: Edges covered in file2 but not in file1.
+            - shared_count: Number of edges covered in both files.
             Each edge is represented as a dictionary with "source" and "target".
     """
-    covered1 = load_edges(file1)
-    covered2 = load_edges(file2)
+    # The two reports are independent, so load them concurrently. Threads share
+    # the results without pickling; file reads release the GIL and overlap,
+    # while the parse itself still runs mostly one report at a time.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future1 = executor.submit(load_edges, file1, cache1)
+        future2 = executor.submit(load_edges, file2, cache2)
+        covered1, covered2 = future1.result(), future2.result()
 
-    only_in_1_keys = set(covered1.keys()) - set(covered2.keys())
-    only_in_2_keys = set(covered2.keys()) - set(covered1.keys())
+    # A difference has to visit every key of its left operand anyway, so
+    # unlike the shared count there is no smaller side to pick here.
+    only_in_1_keys = covered1.keys() - covered2.keys()
+    only_in_2_keys = covered2.keys() - covered1.keys()
 
     only_in_1 = [covered1[k] for k in only_in_1_keys]
     only_in_2 = [covered2[k] for k in only_in_2_keys]
 
-    return only_in_1, only_in_2
+    return only_in_1, only_in_2, count_shared_edges(covered1, covered2)
 
 if __name__ == '__main__':
-    if len(sys.argv) < 3:
-        print("Usage: python compare_edges.py <file1.json> <file2.json> [output.json]")
-        sys.exit(1)
-    file1 = sys.argv[1]
-    file2 = sys.argv[2]
-    output_file = sys.argv[3] if len(sys.argv) > 3 else 'edge_diff.json'
-
-    only_in_1, only_in_2 = compare_coverage(file1, file2)
+    import argparse
+    parser = argparse.ArgumentParser(description="Compare covered edges between two JSON report files")
+    parser.add_argument("file1", type=str, help="Path to the first JSON report file")
+    parser.add_argument("file2", type=str, help="Path to the second JSON report file")
+    parser.add_argument("output_file", type=str, nargs='?', default='edge_diff.json', help="Path to the output JSON file (default: edge_diff.json)")
+    parser.add_argument("--cache", choices=['file1', 'file2', 'both'], help="Cache the parsed covered edges of the given report(s) across runs, e.g. a baseline compared repeatedly", required=False)
+    args = parser.parse_args()
+    output_file = args.output_file
+
+    only_in_1, only_in_2, shared_count = compare_coverage(
+        args.file1, args.file2,
+        cache1=args.cache in ('file1', 'both'),
+        cache2=args.cache in ('file2', 'both'),
+    )
     result = {
         "only_in_file1": only_in_1,
         "only_in_file2": only_in_2
     }
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=4, ensure_ascii=False)
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"Edges covered only in file1: {len(only_in_1)}, only in file2: {len(only_in_2)}, in both: {shared_count}")
     print(f"Result written to {output_file}")
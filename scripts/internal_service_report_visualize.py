@@ -1,52 +1,94 @@
+"""
+This script visualizes the internal service dependency graph recorded in a fuzzer report.
+
+Features:
+- Reads the final call info graph from a JSON report file.
+- Merges calls between the same pair of services into one edge (one edge per method with `--allow_mutiple_edges`).
+- Renders the graph to `service_dependency_graph.svg` with Graphviz.
+
+Usage:
+- python internal_service_report_visualize.py --file_path <report.json> [--show_label] [--allow_mutiple_edges]
+
+Requirements:
+- Python 3
+- Graphviz, with the `dot` executable on PATH, for rendering
+- `orjson` (optional) for faster report parsing
+
+"""
+
 import json
-import networkx as nx
-import matplotlib.pyplot as plt
+import subprocess
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+OUTPUT_FILE = "service_dependency_graph.svg"
 
 def load_json(file_path):
-    with open(file_path, 'r') as f:
-        return json.load(f)
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def build_graph(data, allow_multiple_edges=False):
+    # Group calls by service pair first, so that each pair is emitted once
+    # instead of once per call recorded in the report.
+    methods_by_pair = {}
 
-def build_graph(data):
-    G = nx.DiGraph()
-    
     for edge in data["finalCallInfoGraph"]["edges"]:
-        source = edge["source"]["serviceName"]
-        target = edge["target"]["serviceName"]
-        method = edge["target"]["simpleAPIMethod"]["method"]
-        
-        if args.allow_mutiple_edges:
-            G.add_edge(source, target, label=method)
-        else:
-            if not G.has_edge(source, target):
-                G.add_edge(source, target, label=method)
-    
-    return G
-
-def draw_graph(G, show_label=False):
-    plt.figure(figsize=(10, 6))
-    pos = nx.spring_layout(G)
-    
-    nx.draw(G, pos, with_labels=True, node_color='lightblue', edge_color='gray', node_size=3000, font_size=10, font_weight='bold')
-    
-    if show_label:
-        edge_labels = {(u, v): d['label'] for u, v, d in G.edges(data=True)}
-        nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=8, font_color='red')
-    
-    plt.title("Service Dependency Graph")
-    plt.savefig("service_dependency_graph.svg")
-
-def main(file_path, show_label=False):
+        # Look up each nested object once, this loop runs once per edge
+        source = edge["source"]
+        target = edge["target"]
+        pair = (source["serviceName"], target["serviceName"])
+        methods_by_pair.setdefault(pair, set()).add(target["simpleAPIMethod"]["method"])
+
+    if allow_multiple_edges:
+        return [(source, target, method)
+                for (source, target), methods in methods_by_pair.items()
+                for method in sorted(methods)]
+    return [(source, target, ",".join(sorted(methods)))
+            for (source, target), methods in methods_by_pair.items()]
+
+def quote(s):
+    return '"' + s.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def to_dot(edges, show_label=False):
+    lines = [
+        "digraph G {",
+        '    label="Service Dependency Graph"; labelloc=t;',
+        '    node [shape=ellipse, style=filled, fillcolor=lightblue, fontsize=10, fontname="Helvetica-Bold"];',
+        '    edge [color=gray, fontsize=8, fontcolor=red];',
+    ]
+    for source, target, method in edges:
+        attrs = f" [label={quote(method)}]" if show_label else ""
+        lines.append(f"    {quote(source)} -> {quote(target)}{attrs};")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def draw_graph(edges, show_label=False):
+    # Graphviz's `dot` lays out and renders the graph natively
+    dot = to_dot(edges, show_label)
+    try:
+        subprocess.run(["dot", "-Tsvg", "-o", OUTPUT_FILE], input=dot.encode(), check=True)
+    except FileNotFoundError:
+        raise SystemExit("Graphviz `dot` executable not found, please install Graphviz") from None
+
+def main(file_path, show_label=False, allow_multiple_edges=False):
     data = load_json(file_path)
-    G = build_graph(data)
-    print(f"Number of nodes: {G.number_of_nodes()}")
-    print(f"Number of edges: {G.number_of_edges()}")
-    draw_graph(G, show_label)
+    edges = build_graph(data, allow_multiple_edges)
+    nodes = {service for source, target, _ in edges for service in (source, target)}
+    print(f"Number of nodes: {len(nodes)}")
+    print(f"Number of edges: {len(edges)}")
+    draw_graph(edges, show_label)
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Visualize Service Graph")
     parser.add_argument("--file_path", type=str, help="Path to the JSON file", required=True)
     parser.add_argument("--show_label", action='store_true', help="Display edge labels", required=False)
-    parser.add_argument("--allow_mutiple_edges", action='store_true', help="Allow multiple edges between nodes (edges of different methods between the same node pair are seen as same one)", required=False)
+    parser.add_argument("--allow_mutiple_edges", action='store_true', help="Allow multiple edges between nodes, one per method (by default, edges of different methods between the same node pair are merged into one)", required=False)
     args = parser.parse_args()
-    main(args.file_path, args.show_label)
+    main(args.file_path, args.show_label, args.allow_mutiple_edges)
@@ -2,98 +2,119 @@
 This script analyzes test scenario execution logs, extracting relevant data and visualizing it with graphs.
 
 Features:
-- Reads logs from a specified file.
+- Scans logs from a specified file in a single pass over a memory map.
 - Extracts 'Finish execute current test scenario' logs.
 - Parses edge covered count, edge coverage, and status code count.
-- Generates three SVG graphs:
+- Generates one figure (saved as SVG and PNG, or PNG only with `--png_only`) with three graphs:
   1. Edge Covered Count vs. Test Process
   2. Edge Coverage vs. Test Process
   3. Covered Status Code Count vs. Test Process
 
 Usage:
 - Modify `log_file` to point to your actual log file.
-- Run the script, and it will save the graphs as SVG files.
+- Run the script, and it will save the figure as `test_analysis_all.svg` and `test_analysis_all.png`.
 
 Requirements:
 - Python 3
-- `matplotlib` for plotting
+- `matplotlib` (and `numpy`) for plotting
+- `google-re2` (optional) for faster log scanning
 
 """
 
-import re
+import mmap
+import os
 import json
+import numpy as np
 import matplotlib.pyplot as plt
 
-# Read log file
-def read_logs(file_path):
-    with open(file_path, "r", encoding="utf-8") as file:
-        return file.readlines()
+try:
+    # RE2 compiles the pattern to an automaton and scans in linear time
+    import re2 as re
+except ImportError:  # google-re2 is optional, fall back to the standard library
+    import re
+
+# `.` does not match newlines, so scanning the whole file still matches
+# within a single log line. Case-insensitivity is set inline, as both `re`
+# and `re2` understand it.
+SCENARIO_LOG_PATTERN = re.compile(
+    rb'(?i)Finish execute current test scenario .*?UUID: [a-f0-9\-]+.*?Edge covered count: (\d+).*?Edge coverage: ([0-9\.]+).*?covered status code count: (\d+)'
+)
+
+# One record per finished test scenario, as extracted from the logs
+SCENARIO_RECORD_DTYPE = np.dtype([
+    ('edge_covered_count', np.int64),
+    ('edge_coverage', np.float64),
+    ('status_code_count', np.int64),
+])
+
+# Above this many scenarios, markers are dropped so that each series is drawn
+# as a single path instead of one marker per point
+MARKER_MAX_POINTS = 500
 
 # Extract test scenario logs
-def extract_test_scenarios(logs):
-    pattern = re.compile(
-        r'Finish execute current test scenario .*?UUID: ([a-f0-9\-]+).*?Edge covered count: (\d+).*?Edge coverage: ([0-9\.]+).*?covered status code count: (\d+)',
-        re.IGNORECASE
-    )
+def extract_test_scenarios(file_path):
     test_data = []
-    
-    for log in logs:
-        match = pattern.search(log)
-        if match:
-            uuid = match.group(1)
-            edge_covered_count = int(match.group(2))
-            edge_coverage = float(match.group(3))
-            status_code_count = int(match.group(4))
-            test_data.append((uuid, edge_covered_count, edge_coverage, status_code_count))
-    
+
+    with open(file_path, "rb") as file:
+        # mmap cannot map an empty file
+        if os.fstat(file.fileno()).st_size == 0:
+            return test_data
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for match in SCENARIO_LOG_PATTERN.finditer(mm):
+                # int() and float() parse the bytes groups directly
+                edge_covered_count = int(match.group(1))
+                edge_coverage = float(match.group(2))
+                status_code_count = int(match.group(3))
+                test_data.append((edge_covered_count, edge_coverage, status_code_count))
+
     return test_data
 
 # Plot graphs
-def plot_graphs(test_data, output_prefix="test_analysis"):
-    x = list(range(1, len(test_data) + 1))  # Treat test scenario as a unit
-    edge_covered_counts = [data[1] for data in test_data]
-    edge_coverages = [data[2] for data in test_data]
-    status_code_counts = [data[3] for data in test_data]
-    
-    plt.figure(figsize=(8, 4))
-    plt.plot(x, edge_covered_counts, marker='^', linestyle='-', color='g', label='Edge Covered Count')
-    plt.xlabel("Test Process")
-    plt.ylabel("Edge Covered Count")
-    plt.title("Edge Covered Count Across Test Scenarios")
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.legend()
-    plt.savefig(f"{output_prefix}_edge_covered_count.svg", format="svg")
-    plt.savefig(f"{output_prefix}_edge_covered_count.png", format="png")
-    plt.close()
+def plot_graphs(test_data, output_prefix="test_analysis", png_only=False):
+    x = np.arange(1, len(test_data) + 1)  # Treat test scenario as a unit
+    records = np.fromiter(test_data, dtype=SCENARIO_RECORD_DTYPE, count=len(test_data))
+    edge_covered_counts = records['edge_covered_count']
+    edge_coverages = records['edge_coverage']
+    status_code_counts = records['status_code_count']
     
-    plt.figure(figsize=(8, 4))
-    plt.plot(x, edge_coverages, marker='o', linestyle='-', color='b', label='Edge Coverage')
-    plt.xlabel("Test Process")
-    plt.ylabel("Edge Coverage")
-    plt.title("Edge Coverage Across Test Scenarios")
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.legend()
-    plt.savefig(f"{output_prefix}_edge_coverage.svg", format="svg")
-    plt.savefig(f"{output_prefix}_edge_coverage.png", format="png")
-    plt.close()
-    
-    plt.figure(figsize=(8, 4))
-    plt.plot(x, status_code_counts, marker='s', linestyle='-', color='r', label='Status Code Count')
-    plt.xlabel("Test Process")
-    plt.ylabel("Covered Status Code Count")
-    plt.title("Status Code Coverage Across Test Scenarios")
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.legend()
-    plt.savefig(f"{output_prefix}_status_codes.svg", format="svg")
-    plt.savefig(f"{output_prefix}_status_codes.png", format="png")
-    plt.close()
+    show_markers = len(test_data) < MARKER_MAX_POINTS
+
+    # Draw all three charts on one figure, so that it is laid out and
+    # serialized once per output format. A higher path simplification threshold
+    # than matplotlib's default merges more segments of long series.
+    with plt.rc_context({'path.simplify_threshold': 1.0}):
+        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(8, 12))
+
+        ax1.plot(x, edge_covered_counts, marker='^' if show_markers else None, linestyle='-', color='g', label='Edge Covered Count')
+        ax1.set_xlabel("Test Process")
+        ax1.set_ylabel("Edge Covered Count")
+        ax1.set_title("Edge Covered Count Across Test Scenarios")
+
+        ax2.plot(x, edge_coverages, marker='o' if show_markers else None, linestyle='-', color='b', label='Edge Coverage')
+        ax2.set_xlabel("Test Process")
+        ax2.set_ylabel("Edge Coverage")
+        ax2.set_title("Edge Coverage Across Test Scenarios")
+
+        ax3.plot(x, status_code_counts, marker='s' if show_markers else None, linestyle='-', color='r', label='Status Code Count')
+        ax3.set_xlabel("Test Process")
+        ax3.set_ylabel("Covered Status Code Count")
+        ax3.set_title("Status Code Coverage Across Test Scenarios")
+
+        for ax in (ax1, ax2, ax3):
+            ax.grid(True, linestyle='--', alpha=0.7)
+            ax.legend()
+
+        fig.tight_layout()
+        if not png_only:
+            fig.savefig(f"{output_prefix}_all.svg", format="svg")
+        fig.savefig(f"{output_prefix}_all.png", format="png", dpi=100)
+        plt.close(fig)
 
 # Main function
-def main(log_file):
-    logs = read_logs(log_file)
-    test_data = extract_test_scenarios(logs)
+def main(log_file, png_only=False):
+    test_data = extract_test_scenarios(log_file)
     if test_data:
-        plot_graphs(test_data)
+        plot_graphs(test_data, png_only=png_only)
         print("Graphs saved successfully.")
     else:
         print("No relevant logs found.")
@@ -103,5 +124,6 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Visualize Test Process")
     parser.add_argument("--file_path", type=str, help="Path to the log file", required=True)
+    parser.add_argument("--png_only", action='store_true', help="Only save the PNG figure, skipping the slower SVG output", required=False)
     args = parser.parse_args()
-    main(args.file_path)
+    main(args.file_path, args.png_only)